@@ -38,6 +38,17 @@ class UpdateNotCalled(RuntimeError):
         super().__init__(*args)
 
 
+class NotModified(str):
+    """Output returned instead of rendering a content provider whose output
+    the client already has.
+
+    Test for it using ``isinstance`` or by identity with `NOT_MODIFIED`.
+    """
+
+
+NOT_MODIFIED = NotModified('<!-- content provider not modified -->')
+
+
 class IBeforeUpdateEvent(IObjectEvent):
     """A content provider will be updated"""
 
@@ -120,6 +131,51 @@ class IContentProvider(browser.IBrowserView):
         """
 
 
+class IFingerprintedContentProvider(IContentProvider):
+    """A content provider that can identify the inputs of its rendering.
+
+    After :meth:`update` was called, the provider can compute a fingerprint
+    of all the state its :meth:`render` output depends on. When a client
+    already holds the output belonging to that fingerprint (for example
+    during a partial-page refresh), rendering can be skipped entirely.
+    """
+
+    def fingerprint():
+        """Return a string identifying the inputs of the rendering stage.
+
+        Two calls returning the same fingerprint *must* produce the same
+        output of :meth:`render`, so the fingerprint must cover everything
+        the output depends on, including the state of the request such as
+        the principal, the negotiated language and the skin. Returning
+        ``None`` means that the output cannot be identified and the provider
+        must always be rendered.
+
+        Calling this method before :meth:`update` *may* (but is not required
+        to) raise an `UpdateNotCalled` error.
+        """
+
+
+class IFragmentedContentProvider(IContentProvider):
+    """A content provider that builds its content from fragments.
+
+    :meth:`render` returns the joined fragments, so callers, like the
+    ``provider`` TALES expression, do not need to know about them.
+    `zope.contentprovider.provider.ContentProviderBase` joins the result of
+    :meth:`renderFragments` whether this interface is declared or not.
+    """
+
+    def renderFragments(*args, **kw):
+        """Return the content provided by this content provider as an
+        iterable of strings.
+
+        Joining the fragments *must* result in the output of :meth:`render`
+        called with the same arguments.
+
+        Calling this method before :meth:`update` *may* (but is not required
+        to) raise an `UpdateNotCalled` error.
+        """
+
+
 class IContentProviderType(zope.interface.interfaces.IInterface):
     """Type interface for content provider types
 
@@ -150,4 +206,12 @@ class ITALESProviderExpression(interfaces.ITALESExpression):
 
     The content provider is looked up by the (context, request, view) objects
     and the name (``provider.name``).
+
+    If the provider implements `IFingerprintedContentProvider`, its
+    fingerprint is sent in the
+    ``X-ContentProvider-Fingerprint-<provider.name>.<n>`` response header,
+    where ``<n>`` counts the occurrences of the provider on the page,
+    starting at 0. If the request carries the current fingerprint in the
+    ``contentprovider.fingerprint.<provider.name>.<n>`` form variable, the
+    provider is not rendered and `NOT_MODIFIED` is returned instead.
     """
@@ -13,20 +13,47 @@
 ##############################################################################
 """Simple base class for implementing content providers
 """
+import hashlib
+import json
+
 from zope.component import adapter
 from zope.interface import Interface
+from zope.interface import directlyProvidedBy
 from zope.interface import implementer
+from zope.location.interfaces import ILocation
+from zope.location.location import LocationIterator
 from zope.publisher.browser import BrowserView
 from zope.publisher.interfaces.browser import IBrowserRequest
 
-from zope.contentprovider.interfaces import IContentProvider
+from zope.contentprovider.interfaces import IFingerprintedContentProvider
+from zope.contentprovider.tales import getTALNamespaceFields
+
+
+_FINGERPRINT_TYPES = (str, int, float, bool, type(None))
 
 
-@implementer(IContentProvider)
+def _checkFingerprintValue(name, value):
+    if isinstance(value, tuple):
+        for item in value:
+            _checkFingerprintValue(name, item)
+    elif not isinstance(value, _FINGERPRINT_TYPES):
+        raise TypeError(
+            'Cannot fingerprint %r: unsupported value of type %s'
+            % (name, type(value).__name__))
+
+
+@implementer(IFingerprintedContentProvider)
 @adapter(Interface, IBrowserRequest, Interface)
 class ContentProviderBase(BrowserView):
     """Base class for content providers"""
 
+    # Names of the attributes the output of ``render`` depends on, besides
+    # the context, the principal, locale and skin of the request and the TAL
+    # namespace data. Their values must be strings, numbers, booleans,
+    # ``None`` or tuples of those. ``None`` means the output cannot be
+    # fingerprinted.
+    fingerprintAttributes = None
+
     def __init__(self, context, request, view):
         super().__init__(context, request)
         self.__parent__ = view
@@ -35,5 +62,65 @@ class ContentProviderBase(BrowserView):
         pass
 
     def render(self, *args, **kwargs):
+        return ''.join(self.renderFragments(*args, **kwargs))
+
+    def renderFragments(self, *args, **kwargs):
         raise NotImplementedError(
-            '``render`` method must be implemented by subclass')
+            '``render`` or ``renderFragments`` method must be implemented by '
+            'subclass')
+
+    def fingerprintContext(self):
+        """Return a value identifying the context across requests.
+
+        By default this is the path of names from the context up to the
+        root, so the context must provide `ILocation`.
+        """
+        if self.context is None:
+            return None
+        if not ILocation.providedBy(self.context):
+            raise TypeError(
+                'Cannot fingerprint context %r, which does not provide '
+                'ILocation; override ``fingerprintContext``' % (self.context,))
+        return tuple(getattr(obj, '__name__', None)
+                     for obj in LocationIterator(self.context))
+
+    def fingerprintRequest(self):
+        """Return a value identifying the state of the request.
+
+        By default this is the id of the principal, the locale and the
+        layers (skin) of the request. Any other request data ``render``
+        depends on must be copied to an attribute listed in
+        ``fingerprintAttributes`` during ``update``.
+        """
+        request = self.request
+        if request is None:
+            return None
+        principal = getattr(request, 'principal', None)
+        locale = getattr(request, 'locale', None)
+        return (
+            getattr(principal, 'id', None),
+            locale.getLocaleID() if locale is not None else None,
+            tuple(sorted(layer.__identifier__
+                         for layer in directlyProvidedBy(request))),
+        )
+
+    def fingerprint(self):
+        if self.fingerprintAttributes is None:
+            return None
+        names = set(self.fingerprintAttributes)
+        names.update(getTALNamespaceFields(self))
+        cls = self.__class__
+        state = {
+            'class': f'{cls.__module__}.{cls.__qualname__}',
+            'context': self.fingerprintContext(),
+            'request': self.fingerprintRequest(),
+            'view': getattr(self.__parent__, '__name__', None),
+            'attributes': {name: getattr(self, name) for name in names},
+        }
+        _checkFingerprintValue('context', state['context'])
+        _checkFingerprintValue('request', state['request'])
+        _checkFingerprintValue('view', state['view'])
+        for name, value in state['attributes'].items():
+            _checkFingerprintValue(name, value)
+        data = json.dumps(state, sort_keys=True)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
@@ -22,18 +22,43 @@ from zope.tales import expressions
 from zope.contentprovider import interfaces
 
 
+FINGERPRINT_PREFIX = 'contentprovider.fingerprint.'
+FINGERPRINT_HEADER = 'X-ContentProvider-Fingerprint-'
+
+
+SLOTS_KEY = 'zope.contentprovider.fingerprint.slots'
+
+
+def getTALNamespaceFields(provider):
+    """Return the fields of the TAL attributes requested by the provider"""
+    fields = {}
+
+    for interface in zope.interface.providedBy(provider):
+        if interfaces.ITALNamespaceData.providedBy(interface):
+            fields.update(zope.schema.getFields(interface))
+
+    return fields
+
+
 def addTALNamespaceData(provider, context):
     """Add the requested TAL attributes to the provider"""
     data = {}
 
-    for interface in zope.interface.providedBy(provider):
-        if interfaces.ITALNamespaceData.providedBy(interface):
-            for name, field in zope.schema.getFields(interface).items():
-                data[name] = context.vars.get(name, field.default)
+    for name, field in getTALNamespaceFields(provider).items():
+        data[name] = context.vars.get(name, field.default)
 
     provider.__dict__.update(data)
 
 
+def _nextFingerprintSlot(request, name):
+    # The same provider can be rendered several times on a page, so each
+    # occurrence gets its own slot.
+    slots = request.annotations.setdefault(SLOTS_KEY, {})
+    index = slots.get(name, 0)
+    slots[name] = index + 1
+    return '%s.%d' % (name, index)
+
+
 @zope.interface.implementer(interfaces.ITALESProviderExpression)
 class TALESProviderExpression(expressions.StringExpr):
     """
@@ -75,5 +100,16 @@ class TALESProviderExpression(expressions.StringExpr):
         zope.event.notify(interfaces.BeforeUpdateEvent(provider, request))
         provider.update()
 
+        # Send the fingerprint to the client and skip rendering if the
+        # client already has the current output.
+        if interfaces.IFingerprintedContentProvider.providedBy(provider):
+            fingerprint = provider.fingerprint()
+            if fingerprint is not None:
+                slot = _nextFingerprintSlot(request, name)
+                request.response.setHeader(
+                    FINGERPRINT_HEADER + slot, fingerprint)
+                if request.get(FINGERPRINT_PREFIX + slot) == fingerprint:
+                    return interfaces.NOT_MODIFIED
+
         # Stage 2: Render the HTML content.
         return provider.render()
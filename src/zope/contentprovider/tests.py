@@ -15,7 +15,17 @@
 """
 import unittest
 
+import zope.component
+import zope.interface
+from zope.location.location import Location
+from zope.publisher.browser import TestRequest
+from zope.tales.tales import Context
+from zope.testing import cleanup
+
+from zope.contentprovider import interfaces
 from zope.contentprovider.interfaces import UpdateNotCalled
+from zope.contentprovider.provider import ContentProviderBase
+from zope.contentprovider.tales import TALESProviderExpression
 
 
 class TestExceptionHandling(unittest.TestCase):
@@ -25,3 +35,200 @@ class TestExceptionHandling(unittest.TestCase):
             raise UpdateNotCalled
         except UpdateNotCalled:
             pass
+
+
+class TitleProvider(ContentProviderBase):
+    fingerprintAttributes = ('title',)
+    renderCount = 0
+
+    def update(self):
+        self.title = self.context.title
+
+    def render(self):
+        TitleProvider.renderCount += 1
+        return '<h1>%s</h1>' % self.title
+
+
+class TestFingerprint(cleanup.CleanUp, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        TitleProvider.renderCount = 0
+        zope.component.provideAdapter(
+            TitleProvider, (zope.interface.Interface,) * 3,
+            interfaces.IContentProvider, name='title')
+        self.context = Location()
+        self.context.__name__ = 'page'
+        self.context.title = 'Welcome'
+        self.expr = TALESProviderExpression('provider', 'title', None)
+
+    def _call(self, request, context=None):
+        if context is None:
+            context = self.context
+        return self.expr(Context(None, {
+            'context': context, 'request': request, 'view': None}))
+
+    def _fingerprint(self, request):
+        return request.response.getHeader(
+            'X-ContentProvider-Fingerprint-title.0')
+
+    def test_round_trip_skips_render(self):
+        request = TestRequest()
+        self.assertEqual(self._call(request), '<h1>Welcome</h1>')
+        fingerprint = self._fingerprint(request)
+        self.assertTrue(fingerprint)
+
+        refresh = TestRequest(
+            form={'contentprovider.fingerprint.title.0': fingerprint})
+        result = self._call(refresh)
+        self.assertIs(result, interfaces.NOT_MODIFIED)
+        self.assertIsInstance(result, interfaces.NotModified)
+        self.assertEqual(TitleProvider.renderCount, 1)
+        self.assertEqual(self._fingerprint(refresh), fingerprint)
+
+    def test_changed_state_renders(self):
+        request = TestRequest()
+        self._call(request)
+        self.context.title = 'Goodbye'
+        refresh = TestRequest(
+            form={'contentprovider.fingerprint.title.0':
+                  self._fingerprint(request)})
+        self.assertEqual(self._call(refresh), '<h1>Goodbye</h1>')
+        self.assertNotEqual(
+            self._fingerprint(refresh), self._fingerprint(request))
+
+    def test_same_provider_twice(self):
+        second = Location()
+        second.__name__ = 'second'
+        second.title = 'B'
+        request = TestRequest()
+        self.context.title = 'A'
+        self._call(request)
+        self._call(request, second)
+        form = {
+            'contentprovider.fingerprint.title.%d' % n:
+            request.response.getHeader(
+                'X-ContentProvider-Fingerprint-title.%d' % n)
+            for n in (0, 1)}
+        self.assertNotEqual(form['contentprovider.fingerprint.title.0'],
+                            form['contentprovider.fingerprint.title.1'])
+
+        self.context.title = 'B'
+        refresh = TestRequest(form=form)
+        self.assertEqual(self._call(refresh), '<h1>B</h1>')
+        self.assertIs(self._call(refresh, second), interfaces.NOT_MODIFIED)
+
+    def test_principal_changes_fingerprint(self):
+        class Principal:
+            id = 'bob'
+
+        request = TestRequest()
+        self._call(request)
+        refresh = TestRequest(
+            form={'contentprovider.fingerprint.title.0':
+                  self._fingerprint(request)})
+        refresh.setPrincipal(Principal())
+        self.assertEqual(self._call(refresh), '<h1>Welcome</h1>')
+        self.assertNotEqual(
+            self._fingerprint(refresh), self._fingerprint(request))
+
+    def test_wrong_fingerprint_renders(self):
+        refresh = TestRequest(
+            form={'contentprovider.fingerprint.title.0': 'outdated'})
+        self.assertEqual(self._call(refresh), '<h1>Welcome</h1>')
+
+    def test_rendered_marker_text_is_not_the_marker(self):
+        class MarkerTextProvider(TitleProvider):
+            def render(self):
+                return '<!-- content provider not modified -->'
+
+        zope.component.provideAdapter(
+            MarkerTextProvider, (zope.interface.Interface,) * 3,
+            interfaces.IContentProvider, name='title')
+        result = self._call(TestRequest())
+        self.assertEqual(result, interfaces.NOT_MODIFIED)
+        self.assertNotIsInstance(result, interfaces.NotModified)
+
+    def test_unfingerprinted_provider_sends_no_header(self):
+        class UnfingerprintedProvider(TitleProvider):
+            fingerprintAttributes = None
+
+        zope.component.provideAdapter(
+            UnfingerprintedProvider, (zope.interface.Interface,) * 3,
+            interfaces.IContentProvider, name='title')
+        request = TestRequest()
+        self._call(request)
+        self.assertIsNone(self._fingerprint(request))
+
+    def test_missing_attribute(self):
+        provider = TitleProvider(self.context, TestRequest(), None)
+        with self.assertRaises(AttributeError):
+            provider.fingerprint()
+
+    def test_unsupported_value(self):
+        provider = TitleProvider(self.context, TestRequest(), None)
+        provider.update()
+        provider.title = frozenset(['a', 'b'])
+        with self.assertRaises(TypeError):
+            provider.fingerprint()
+
+    def test_unlocated_context(self):
+        provider = TitleProvider(object(), TestRequest(), None)
+        provider.title = 'Welcome'
+        with self.assertRaises(TypeError):
+            provider.fingerprint()
+
+
+@zope.interface.implementer(interfaces.IFragmentedContentProvider)
+class ListProvider(ContentProviderBase):
+
+    def renderFragments(self, *items, **kwargs):
+        tag = kwargs.get('tag', 'li')
+        for item in items:
+            yield f'<{tag}>{item}</{tag}>'
+
+
+class WrappedListProvider(ListProvider):
+
+    def render(self, *args, **kwargs):
+        return '<ul>%s</ul>' % super().render(*args, **kwargs)
+
+
+class TestFragments(cleanup.CleanUp, unittest.TestCase):
+
+    def test_render_joins_fragments(self):
+        provider = ListProvider(None, None, None)
+        self.assertEqual(provider.render('a', 'b'), '<li>a</li><li>b</li>')
+
+    def test_render_passes_arguments(self):
+        provider = ListProvider(None, None, None)
+        self.assertEqual(
+            provider.render('a', tag='p'),
+            ''.join(provider.renderFragments('a', tag='p')))
+        self.assertEqual(provider.render('a', tag='p'), '<p>a</p>')
+
+    def test_missing_renderFragments(self):
+        @zope.interface.implementer(interfaces.IFragmentedContentProvider)
+        class BadProvider(ContentProviderBase):
+            pass
+
+        with self.assertRaises(NotImplementedError) as cm:
+            BadProvider(None, None, None).render()
+        self.assertIn('``render`` or ``renderFragments``',
+                      str(cm.exception))
+
+    def test_renderFragments_without_interface(self):
+        class UndeclaredProvider(ContentProviderBase):
+            def renderFragments(self):
+                return ['a', 'b']
+
+        self.assertEqual(UndeclaredProvider(None, None, None).render(), 'ab')
+
+    def test_tales_uses_render(self):
+        zope.component.provideAdapter(
+            WrappedListProvider, (zope.interface.Interface,) * 3,
+            interfaces.IContentProvider, name='list')
+        expr = TALESProviderExpression('provider', 'list', None)
+        result = expr(Context(None, {
+            'context': None, 'request': TestRequest(), 'view': None}))
+        self.assertEqual(result, '<ul></ul>')